@@ -6,7 +6,7 @@ import bpy
 from bpy.types import AddonPreferences, AnyType
 
 from . import util, loops  # Note: we must import 'loops' to register the classes.
-from .util import (BlenderClass, binding_def, bindings_clear, register_BlenderClasses,
+from .util import (BlenderClass, binding_def_one, bindings_clear, register_BlenderClasses,
                    unregister_BlenderClasses)
 
 bl_info = {
@@ -23,13 +23,14 @@ def register_bindings(context):
     """Registers all key bindings for the addon. This method is called automatically when the addon is enabled."""
     util.keymap_def("Mesh")
     if context.preferences.addons[__name__].preferences.override_resize:
-        binding_def("Mesh", "mesh.edgy_resize_selection", "NUMPAD_PLUS", "PRESS", "C", repeat=True,
-                    direction="GROW")
-        binding_def("Mesh", "mesh.edgy_resize_selection", "NUMPAD_MINUS", "PRESS", "C", repeat=True,
-                    direction="SHRINK")
+        binding_def_one("Mesh", "mesh.edgy_resize_selection", "NUMPAD_PLUS", "PRESS", "C", repeat=True,
+                        direction="GROW")
+        binding_def_one("Mesh", "mesh.edgy_resize_selection", "NUMPAD_MINUS", "PRESS", "C", repeat=True,
+                        direction="SHRINK")
     if context.preferences.addons[__name__].preferences.override_select:
-        binding_def("Mesh", "mesh.edgy_select_loop", "LEFTMOUSE", "CLICK", "A", extend=False)
-        binding_def("Mesh", "mesh.edgy_select_loop", "LEFTMOUSE", "CLICK", "AS", extend=True)
+        binding_def_one("Mesh", "mesh.edgy_select_loop", "LEFTMOUSE", "CLICK", "A", extend=False)
+        binding_def_one("Mesh", "mesh.edgy_select_loop", "LEFTMOUSE", "CLICK", "AS", extend=True)
+    util.freeze_keymaps()
 
 def update_bindings(_, context):
     """Refreshes the key bindings for the addon. This method gets triggered when the addon preferences change."""
@@ -1,18 +1,17 @@
 # This code is licensed under CC0 (Public Domain). You may freely use or modify it for any purpose.
 # The original code was written by GadFlight and can be found at his GitHub repository: (https://github.com/GadFlight)
 
-from asyncore import loop
 from collections import defaultdict, deque
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from types import NoneType
 from typing import Any, Mapping, Optional, Type, cast
 
 import bmesh
 import bpy
+import numpy as np
 from bmesh.types import BMEdge, BMesh, BMFace, BMVert
 from bpy.props import (EnumProperty, BoolProperty)
 from bpy.types import Context, Event, Mesh, Operator, AnyType
-from heapq import heappush, heappop
 
 from . import util
 from .util import OPTIONS_REDO, BlenderOperator, make_enum, report_finished
@@ -45,31 +44,63 @@ class PureEdgeLoop:
 
     def __eq__(self, other: 'PureEdgeLoop') -> bool:
         """Return True if the edge sets of the two loops are equal."""
-        if isinstance(other, self.__class__):
+        try:
             return self.edge_set == other.edge_set
-        return False
+        except AttributeError:
+            return NotImplemented
+
+    def __hash__(self) -> int:
+        """Return a hash consistent with __eq__. (Frozensets cache their hash, so this is cheap.)"""
+        return hash(self.edge_set)
 
     def __repr__(self):
         """Return a compact string representation of the edges."""
         return f"PureEdgeLoop(edges=({', '.join(map(str, self.edges))})"
 
-def find_loop(edge: BMEdge, start: BMVert, stop_set: Optional[set[int]] = None) -> PureEdgeLoop:
+def edge_faces(edge: BMEdge, face_cache: dict[int, frozenset[int]]) -> frozenset[int]:
+    """Return the indices of the faces linked to edge, remembering them in face_cache (keyed by edge index)."""
+    key = edge.index
+    faces = face_cache.get(key)
+    if faces is None:
+        faces = face_cache[key] = frozenset(face.index for face in edge.link_faces)
+    return faces
+
+def find_loop(edge: BMEdge, start: BMVert, stop_set: Optional[set[int]] = None,
+              pole_mask: Optional[list[bool]] = None, face_cache: Optional[dict[int, frozenset[int]]] = None,
+              pole_cache: Optional[dict[int, bool]] = None) -> PureEdgeLoop:
     """Return a PureEdgeLoop starting at start and ending at a pole or boundary, or back at the start point. 
-    If stop_set is not None, then the loop will end at a vertex in stop_set.
+    If stop_set is not None, then the loop will end at a vertex in stop_set. If pole_mask is not None, it
+    gives the pole status of every vertex by index (see compute_pole_mask), and is used instead of is_pole.
+
+    Loop searches revisit the same elements many times, so callers making several find_loop calls on one mesh
+    can pass the same face_cache and pole_cache dicts to each, to avoid repeatedly walking 'link_faces' and
+    'link_edges'. These are only valid for the current mesh topology, so they shouldn't outlive the search.
     
     Note: since this function doesn't search in both directions, the 'PureEdgeLoop' result will not necessarily
     be 'pure' if the loop is not closed."""
     stop_set = stop_set or set()
+    face_cache = {} if face_cache is None else face_cache
+    pole_cache = {} if pole_cache is None else pole_cache
     last_edge, tail, head = edge, start, edge.other_vert(start)
     vertices, edges = [tail.index, head.index], [last_edge.index]
+    last_faces = edge_faces(last_edge, face_cache)
     while True:
-        if is_pole(head) or head.index in stop_set:
+        head_index = head.index
+        if pole_mask is not None:
+            pole = pole_mask[head_index]
+        else:
+            pole = pole_cache.get(head_index)
+            if pole is None:
+                pole = pole_cache[head_index] = is_pole(head)
+        if pole or head_index in stop_set:
             return PureEdgeLoop(tuple(vertices), tuple(edges), frozenset(edges))
         for next_edge in head.link_edges:
-            if not any(face in next_edge.link_faces for face in last_edge.link_faces):
+            next_faces = edge_faces(next_edge, face_cache)
+            if last_faces.isdisjoint(next_faces):
                 if next_edge == edge:
                     return PureEdgeLoop(tuple(vertices), tuple(edges), frozenset(edges))
                 last_edge, tail, head = next_edge, head, next_edge.other_vert(head)
+                last_faces = next_faces
                 vertices.append(head.index)
                 edges.append(last_edge.index)
                 break
@@ -78,39 +109,61 @@ def find_loop(edge: BMEdge, start: BMVert, stop_set: Optional[set[int]] = None)
             # punt and treat it like a pole.
             return PureEdgeLoop(tuple(vertices), tuple(edges), frozenset(edges))
 
+def compute_pole_mask(bm: BMesh) -> list[bool]:
+    """Return the result of is_pole for every vertex in the mesh, indexed by vertex index. This is computed in
+    bulk, which is much cheaper than calling is_pole on every vertex when walking the whole mesh."""
+    num_verts, num_edges = len(bm.verts), len(bm.edges)
+    edge_verts = np.fromiter((vert.index for edge in bm.edges for vert in edge.verts), np.int32,
+                             count=2 * num_edges)
+    degrees = np.bincount(edge_verts, minlength=num_verts)
+    boundary = np.fromiter((vert.is_boundary for vert in bm.verts), np.int8, count=num_verts)
+    wire = np.fromiter((vert.is_wire for vert in bm.verts), np.int8, count=num_verts)
+    # Converted to a list, since indexing single elements of a NumPy array is comparatively slow.
+    return ((degrees + boundary + wire) != 4).tolist()
+
 def pure_edge_loops(bm: BMesh) -> list[PureEdgeLoop]:
     """Return a list of all "pure" edge loops in the mesh."""
-    poles = {vert for vert in bm.verts if is_pole(vert)}
+    poles_by_index = compute_pole_mask(bm)
+    face_cache: dict[int, frozenset[int]] = {}
+    poles = [vert for vert, pole in zip(bm.verts, poles_by_index) if pole]
     result: list[PureEdgeLoop] = []
-    visited: set[int] = set()
+    # One flag per edge, marking edges which are already part of a loop.
+    visited = np.zeros(len(bm.edges), dtype=np.bool_)
     # Find incomplete loops based at poles. We do these first because we want to ensure that they
     # start at a pole rather than the middle of the loop.
     for pole in poles:
         for edge in pole.link_edges:
-            if edge.index in visited:
+            if visited[edge.index]:
                 continue
-            loop = find_loop(edge, pole)
+            loop = find_loop(edge, pole, pole_mask=poles_by_index, face_cache=face_cache)
             result.append(loop)
-            visited.update(loop.edge_set)
-    # Find all other loops
-    for edge in bm.edges:
-        if edge.index in visited:
+            visited[list(loop.edges)] = True
+    # Find all other loops. Only the edges not yet covered need to be considered, though we still have to
+    # recheck each one, since finding a loop marks the edges further along it.
+    edges = bm.edges
+    for index in np.flatnonzero(~visited).tolist():
+        if visited[index]:
             continue
-        loop = find_loop(edge, edge.verts[0])
+        edge = edges[index]
+        loop = find_loop(edge, edge.verts[0], pole_mask=poles_by_index, face_cache=face_cache)
         result.append(loop)
-        visited.update(loop.edge_set)
+        visited[list(loop.edges)] = True
     return result
 
-def pure_edge_loop(bm: BMesh, edge: BMEdge) -> PureEdgeLoop:
+def pure_edge_loop(bm: BMesh, edge: BMEdge, face_cache: Optional[dict[int, frozenset[int]]] = None,
+                   pole_cache: Optional[dict[int, bool]] = None) -> PureEdgeLoop:
     """Return the pure edge loop containing edge. The first edge in the loop will either be a pole or
-    the edge itself."""
+    the edge itself. face_cache and pole_cache are passed on to find_loop."""
+    face_cache = {} if face_cache is None else face_cache
+    pole_cache = {} if pole_cache is None else pole_cache
     # This could be faster, but should be good enough, while maintaining simplicity.
     tail = edge.verts[0]
-    partial = find_loop(edge, tail)
+    partial = find_loop(edge, tail, face_cache=face_cache, pole_cache=pole_cache)
     if partial.vertices[0] == partial.vertices[-1]:
         # A closed loop. We're done.
         return partial
-    result = find_loop(bm.edges[partial.edges[-1]], bm.verts[partial.vertices[-1]])
+    result = find_loop(bm.edges[partial.edges[-1]], bm.verts[partial.vertices[-1]], face_cache=face_cache,
+                       pole_cache=pole_cache)
     if result.edges[-1] == edge.index:
         # It's handy if the supplied edge can be first.
         return PureEdgeLoop(tuple(reversed(result.vertices)), tuple(reversed(result.edges)),
@@ -134,38 +187,42 @@ class EdgeSelectionInfo:
         selected_edges = [edge for edge in bm.edges if edge.select]
         if not selected_edges:
             return EdgeSelectionInfo(tuple(), tuple(), tuple(), all_verts)
-        # Map selected vertices to their connecting selected edges
-        selected_verts_to_edges: Mapping[BMVert, list[BMEdge]] = defaultdict(list)
-        for edge in selected_edges:
-            for vert in edge.verts:
-                selected_verts_to_edges[vert].append(edge)
-
-        endpoints = tuple(
-            vert.index for vert, edges in selected_verts_to_edges.items() if len(edges) == 1)
-        branches = tuple(
-            vert.index for vert, edges in selected_verts_to_edges.items() if len(edges) > 2)
-
-        # Find connected edge groups (islands)
-        edge_islands: list[tuple[int, ...]] = []
-        searched_edges: set[BMEdge] = set()
-        for edge in selected_edges:
-            if edge in searched_edges:
-                continue
-
-            # Search connected edges
-            island: list[int] = []
-            edges_to_search = {edge}
-
-            while edges_to_search:
-                current_edge = edges_to_search.pop()
-                island.append(current_edge.index)
-                searched_edges.add(current_edge)
-                # Add connected edges to search list
-                for vert in current_edge.verts:
-                    edges_to_search.update(edge for edge in selected_verts_to_edges[vert]
-                                           if edge not in searched_edges)
-
-            edge_islands.append(tuple(island))
+        # Map selected vertices to their connecting selected edges. 'edge_verts' holds the two (compacted)
+        # vertex ids of each selected edge, and 'vert_edges' holds the positions in 'selected_edges' of the
+        # edges meeting at each vertex. The grouping is done with a single sort rather than a Python dict.
+        vert_indices = np.fromiter((vert.index for edge in selected_edges for vert in edge.verts), np.int32,
+                                   count=2 * len(selected_edges))
+        vert_ids, edge_verts = np.unique(vert_indices, return_inverse=True)
+        degrees = np.bincount(edge_verts)
+        by_vert = np.argsort(edge_verts, kind="stable") // 2
+        vert_edges = [group.tolist() for group in np.split(by_vert, np.cumsum(degrees)[:-1])]
+
+        endpoints = tuple(vert_ids[degrees == 1].tolist())
+        branches = tuple(vert_ids[degrees > 2].tolist())
+
+        # Find connected edge groups (islands) by merging the edges which meet at each vertex, using a
+        # union-find over positions in 'selected_edges'.
+        parent = list(range(len(selected_edges)))
+
+        def find(x: int) -> int:
+            root = x
+            while parent[root] != root:
+                root = parent[root]
+            while parent[x] != root:
+                parent[x], x = root, parent[x]
+            return root
+
+        for edges in vert_edges:
+            first = find(edges[0])
+            for other in edges[1:]:
+                root = find(other)
+                if root != first:
+                    parent[root] = first
+
+        islands: Mapping[int, list[int]] = defaultdict(list)
+        for i, edge in enumerate(selected_edges):
+            islands[find(i)].append(edge.index)
+        edge_islands = [tuple(island) for island in islands.values()]
 
         return EdgeSelectionInfo(tuple(edge_islands), endpoints, branches, all_verts)
 
@@ -202,9 +259,16 @@ class SavedSelectionState:
         context.tool_settings.mesh_select_mode = list(self.mode)
         bm = bmesh.from_edit_mesh(cast(Mesh, context.active_object.data))
         if self.mode[0]:
+            # Vertex flags are independent, and select_flush_mode rebuilds the edges and faces from them, so
+            # we only need to assign where the state actually changes.
+            selected = self.selected_verts
             for v in bm.verts:
-                v.select = v.index in self.selected_verts
+                state = v.index in selected
+                if v.select != state:
+                    v.select = state
         elif self.mode[1]:
+            # Deselecting an edge or face also deselects its orphaned vertices (and edges), even if it was
+            # already deselected, and select_flush_mode won't repair those. So every element is assigned.
             for e in bm.edges:
                 e.select = e.index in self.selected_edges
         else:
@@ -217,37 +281,56 @@ class SavedSelectionState:
             bm.select_history.add(items[self.active])
 
 def find_shortest_path(bm: BMesh, start: BMVert, end: BMVert,
-                       exclude_indices: set[int]) -> Optional[tuple[int, ...]]:
+                       exclude_indices: set[int]) -> Optional[tuple[tuple[int, ...], tuple[int, ...]]]:
     """Find the shortest path between two vertices, while avoiding edges in the provided exclusion set. We define
-    'shortest' as the path with the fewest number of edges."""
-    vert_to_verts: Mapping[int, list[int]] = defaultdict(list)
-    for edge in bm.edges:
-        if edge.index in exclude_indices:
-            continue
-        for vert in edge.verts:
-            vert_to_verts[vert.index].append(edge.other_vert(vert).index)
-
-    # Perform a breadth-first search to find the shortest path
-    queue: deque[tuple[int, tuple[int, ...]]] = deque([(start.index, ())])
-    searched_verts = set[int]()
+    'shortest' as the path with the fewest number of edges.
+    
+    The result holds the vertices along the path, and the edges between them (so there is one fewer edge
+    than vertices)."""
+    verts = bm.verts
+    end_index = end.index
+    # The indices of each vertex's faces, filled in as the search reaches it.
+    vert_faces: dict[int, frozenset[int]] = {}
+
+    def faces_of(index: int) -> frozenset[int]:
+        faces = vert_faces.get(index)
+        if faces is None:
+            faces = vert_faces[index] = frozenset(face.index for face in verts[index].link_faces)
+        return faces
+
+    # Perform a breadth-first search to find the shortest path. Rather than carrying a path with each queue
+    # entry, we record the vertex (and edge) each one was first reached from, and walk that chain back once
+    # at the end. Since the queue is FIFO, the first vertex to reach a neighbor is also the first one that
+    # would have been popped, so this gives the same results as tracking full paths.
+    queue: deque[int] = deque([start.index])
+    parent: dict[int, tuple[int, int]] = {start.index: (-1, -1)}
     while queue:
-        current_vert, path = queue.popleft()
-        if current_vert in searched_verts:
-            continue
-        searched_verts.add(current_vert)
-        if current_vert == end.index:
-            return path + (current_vert,)
+        current_vert = queue.popleft()
+        if current_vert == end_index:
+            path: list[int] = [current_vert]
+            path_edges: list[int] = []
+            current_vert, edge_index = parent[current_vert]
+            while current_vert != -1:
+                path.append(current_vert)
+                path_edges.append(edge_index)
+                current_vert, edge_index = parent[current_vert]
+            return tuple(reversed(path)), tuple(reversed(path_edges))
+        vert = verts[current_vert]
+        neighbor_edges = {edge.other_vert(vert).index: edge.index for edge in vert.link_edges
+                          if edge.index not in exclude_indices}
+        neighbors = list(neighbor_edges)
         # we prioritize verts that don't share a face with the last vert in the path.
         # this yields more natural-looking results.
-        non_sharing = {
-            vert for vert in vert_to_verts[current_vert]
-            if path and not any(face in bm.verts[vert].link_faces
-                                for face in bm.verts[path[-1]].link_faces)
-        }
-        queue.extend((vert, path + (current_vert,)) for vert in non_sharing)
-        queue.extend((vert, path + (current_vert,))
-                     for vert in vert_to_verts[current_vert]
-                     if vert not in non_sharing)
+        previous = parent[current_vert][0]
+        if previous == -1:
+            non_sharing = set()
+        else:
+            previous_faces = faces_of(previous)
+            non_sharing = {neighbor for neighbor in neighbors if previous_faces.isdisjoint(faces_of(neighbor))}
+        for neighbor in [*non_sharing, *(n for n in neighbors if n not in non_sharing)]:
+            if neighbor not in parent:
+                parent[neighbor] = (current_vert, neighbor_edges[neighbor])
+                queue.append(neighbor)
     return None
 
 @BlenderOperator("mesh.edgy_close_loop", OPTIONS_REDO, "Close Loop",
@@ -267,25 +350,25 @@ class CloseLoop(Operator):
             self.report({"WARNING"}, "No edges selected")
             return {"CANCELLED"}
         saved_state = SavedSelectionState.from_context(context)
+        verts, edges = bm.verts, bm.edges
         # find pairs of endpoints that share an island
         for i, island in enumerate(info.edge_islands):
-            verts = {v.index for e in island for v in bm.edges[e].verts}
-            ends = [v for v in info.endpoints if v in verts]
+            island_verts = {v.index for e in island for v in edges[e].verts}
+            ends = [v for v in info.endpoints if v in island_verts]
             if len(ends) != 2:
                 continue
-            path = find_shortest_path(bm, bm.verts[ends[0]], bm.verts[ends[1]], set(island))
-            if not path:
+            found = find_shortest_path(bm, verts[ends[0]], verts[ends[1]], set(island))
+            if not found:
                 saved_state.restore(context)
                 self.report({"WARNING"}, "Could not find clean closures")
                 return {"CANCELLED"}
+            path, path_edges = found
             if 'VERT' in bm.select_mode:
                 for v in path:
-                    bm.verts[v].select = True
+                    verts[v].select = True
             else:
-                for pair in zip(path, path[1:]):
-                    for edge in (e for e in bm.verts[pair[0]].link_edges
-                                 if e.verts[0].index == pair[1] or e.verts[1].index == pair[1]):
-                        edge.select = True
+                for e in path_edges:
+                    edges[e].select = True
             bm.select_flush_mode()
             bmesh.update_edit_mesh(cast(Mesh, context.object.data))
         return {"FINISHED"}
@@ -379,24 +462,32 @@ def edge_under_mouse(context: Context, mouse_x: int, mouse_y: int):
     cleans up so that the selection state is unchanged."""
     mesh = cast(Mesh, context.active_object.data)
     bm = bmesh.from_edit_mesh(mesh)
-    sel = SavedSelectionState.from_context(context)
+    # The geometry doesn't change here, so rather than a full SavedSelectionState we only keep the flags for
+    # the current select mode and the active element, and restore them as SavedSelectionState.restore does.
+    mode = list(context.tool_settings.mesh_select_mode)
+    items = bm.verts if mode[0] else bm.edges if mode[1] else bm.faces
+    selected = [item.select for item in items]
+    active = bm.select_history.active
     region = context.region
     coord = mouse_x - region.x, mouse_y - region.y
     context.tool_settings.mesh_select_mode = [False, True, False]
     bpy.ops.view3d.select(extend=False, location=coord)
     e = next((e for e in bm.edges if e.select), None)
-    sel.restore(context)
-    return cast(int, e.index) if e else -1
-
-@dataclass(order=True, slots=True)
-class LoopSearchNode:
-    """A node in the search tree for finding the shortest loop containing a given edge.
-    
-    'length' could be any value to be optimized, but in the current code is the total number of 
-    edges in the loop."""
-    length: float
-    end_vertex: int  # comparing this will produce deterministic results
-    loops: list[PureEdgeLoop] = field(compare=False)
+    index = cast(int, e.index) if e else -1
+    context.tool_settings.mesh_select_mode = mode
+    if mode[0]:
+        for item, state in zip(items, selected):
+            if item.select != state:
+                item.select = state
+    else:
+        # As in SavedSelectionState.restore, edges and faces are always assigned, since deselecting one also
+        # deselects its orphaned elements.
+        for item, state in zip(items, selected):
+            item.select = state
+    bm.select_flush_mode()
+    if active is not None:
+        bm.select_history.add(active)
+    return index
 
 MAX_EDGE_LOOPS = 10
 
@@ -406,42 +497,58 @@ def get_edge_loops(bm: BMesh, edge: BMEdge) -> list[frozenset[int]]:
     It includes the 'pure edge loop' containing the edge and, if the loop is not already closed, some of the 
     shortest closed loops which can be formed using it and other pure edge loops."""
 
-    pure_loop = pure_edge_loop(bm, edge)
+    # Face and pole information shared by every find_loop call in this search.
+    face_cache: dict[int, frozenset[int]] = {}
+    pole_cache: dict[int, bool] = {}
+    pure_loop = pure_edge_loop(bm, edge, face_cache, pole_cache)
     all_loops = [pure_loop.edge_set]
     if pure_loop.is_closed:
         return all_loops
 
+    verts = bm.verts
     visited_verts = set()
     stop_set = {pure_loop.vertices[0]}
-    # Priority queue for best-first search (BFS) Prioritize by the total length of loop sequence (fewer edges is better)
-    queue = [LoopSearchNode(len(pure_loop.edges), pure_loop.vertices[-1], [pure_loop])]
+    # Best-first search (BFS), prioritized by the total length of loop sequence (fewer edges is better).
+    # Lengths are small integers which never decrease as a sequence grows, so rather than a heap we keep a
+    # FIFO bucket of entries per length, and work through the lengths in order. Each entry holds the end
+    # vertex of a loop sequence and the union of its edges, accumulated as the sequence grows.
+    length = len(pure_loop.edges)
+    buckets: defaultdict[int, deque[tuple[int, frozenset[int]]]] = defaultdict(deque)
+    buckets[length].append((pure_loop.vertices[-1], pure_loop.edge_set))
+    pending = 1
     shortest_match = len(bm.edges) + 1  # No match is longer than this
-    while queue:
-        candidate = heappop(queue)
+    while pending:
+        bucket = buckets[length]
+        if not bucket:
+            del buckets[length]
+            length += 1
+            continue
+        end_vertex, candidate_edges = bucket.popleft()
+        pending -= 1
         # We may want multiple algorithms: shortest only vs. all (within limits)
         if len(all_loops) > MAX_EDGE_LOOPS: 
             break
-        if candidate.end_vertex == pure_loop.vertices[0]:  # Closed loop
-            shortest_match = candidate.length
-            all_loops.append(frozenset(edge for l in candidate.loops for edge in l.edge_set))
+        if end_vertex == pure_loop.vertices[0]:  # Closed loop
+            shortest_match = length
+            all_loops.append(candidate_edges)
             continue
         # There's still more to find -- carry on.
-        if candidate.end_vertex in visited_verts:
+        if end_vertex in visited_verts:
             continue
-        visited_verts.add(candidate.end_vertex)
-        v = bm.verts[candidate.end_vertex]
+        visited_verts.add(end_vertex)
+        v = verts[end_vertex]
         for loop_edge in v.link_edges:
-            if any(loop_edge.index in loop.edge_set for loop in candidate.loops):
+            if loop_edge.index in candidate_edges:
                 # Mostly this catches immediate backtracking, but it also handles
                 # obscure edge cases involving non-manifold geometry.
                 continue
             # The stop set lets us handle return to a start vertex that's in the middle
             # of a loop. This is a case that only occurs for non-manifold geometry, but the
             # resulting behavior feels inuitively correct.
-            next_loop = find_loop(loop_edge, v, stop_set)
-            new_sequence = candidate.loops + [next_loop]
-            total_edges = sum(len(loop.edges) for loop in new_sequence)
-            heappush(queue, LoopSearchNode(total_edges, next_loop.vertices[-1], new_sequence))
+            next_loop = find_loop(loop_edge, v, stop_set, face_cache=face_cache, pole_cache=pole_cache)
+            buckets[length + len(next_loop.edges)].append(
+                (next_loop.vertices[-1], candidate_edges | next_loop.edge_set))
+            pending += 1
     return all_loops
 
 # Package-level variables for tracking state across operator invocations. This is necessary because
@@ -474,15 +581,17 @@ class EdgySelectLoop(Operator):
             return bpy.ops.mesh.loop_select('INVOKE_DEFAULT', toggle=self.extend)
 
         bm = bmesh.from_edit_mesh(cast(Mesh, context.object.data))
+        edges = bm.edges
         edge = edge_under_mouse(context, self.mouse_x, self.mouse_y)
         if edge == -1:
             self.report({"WARNING"}, "No edge selected under mouse")
             return {"CANCELLED"}
-        loops = get_edge_loops(bm, bm.edges[edge])
+        loops = get_edge_loops(bm, edges[edge])
+        loop_index = {loop: i for i, loop in enumerate(loops)}
         global current_loop, old_selection, current_mesh
         try:
             is_cache_obsolete = current_mesh != context.object.data or (
-                current_loop and not all(bm.edges[e].select for e in current_loop))
+                current_loop and not all(edges[e].select for e in current_loop))
         except IndexError:
             is_cache_obsolete = True
         if is_cache_obsolete:
@@ -490,18 +599,18 @@ class EdgySelectLoop(Operator):
             old_selection = None
             current_mesh = context.object.data
 
-        if current_loop is None or current_loop not in loops:
+        if current_loop is None or current_loop not in loop_index:
             next_loop = loops[0]
             if not self.extend:
                 old_selection = None
-            elif all(bm.edges[e].select for e in loops[0]):
+            elif all(edges[e].select for e in loops[0]):
                 # special case if we try to extend a selection that is a loop but not
                 # the current loop
                 for edge in loops[0]:
-                    bm.edges[edge].select_set(False)
+                    edges[edge].select_set(False)
                 old_selection = SavedSelectionState.from_context(context)
                 for edge in loops[0]:
-                    bm.edges[edge].select_set(True)
+                    edges[edge].select_set(True)
                 next_loop = frozenset()
             else:
                 old_selection = SavedSelectionState.from_context(context)
@@ -510,13 +619,13 @@ class EdgySelectLoop(Operator):
                 loops.append(frozenset())
             else:
                 old_selection = None
-            next_loop = loops[(loops.index(current_loop) + 1) % len(loops)]
+            next_loop = loops[(loop_index[current_loop] + 1) % len(loops)]
         current_loop = next_loop
         if old_selection:
             old_selection.restore(context)
         else:
             bpy.ops.mesh.select_all(action='DESELECT')
         for edge in next_loop:
-            bm.edges[edge].select = True
+            edges[edge].select = True
         bm.select_flush_mode()
         return {"FINISHED"}
@@ -1,73 +1,150 @@
 # This code is licensed under CC0 (Public Domain). You may freely use or modify it for any purpose.
 # The original code was written by GadFlight and can be found at his GitHub repository: (https://github.com/GadFlight)
 
-from collections import defaultdict
-from typing import Iterable, Type, Union
-import traceback as exc
+from keyword import iskeyword
+from typing import Any, Callable, Iterable, Optional, Type, Union
 
 import bpy
-from bpy.types import KeyConfig, KeyMap, Context
+from bpy.types import KeyConfig, KeyMap, KeyMapItem, Context
 from bpy.utils import register_class, unregister_class
 
 keymaps: dict[str, KeyMap] = {}
+# The items created via binding_def, for each keymap defined via keymap_def.
+addon_keymaps: dict[str, list[KeyMapItem]] = {}
+
+_addon_kc: Optional[KeyConfig] = None
+
+def _kc() -> Optional[KeyConfig]:
+    """Returns the addon keyconfig, resolving it only once per registration pass. This is None when Blender is
+    running in background mode."""
+    global _addon_kc
+    if _addon_kc is None:
+        _addon_kc = bpy.context.window_manager.keyconfigs.addon
+    return _addon_kc
+
+def _reset_kc():
+    """Forgets the keyconfig cached by _kc, so that it is looked up again on the next registration pass."""
+    global _addon_kc
+    _addon_kc = None
 
 def keymap_def(name, space_type='EMPTY', region_type='WINDOW'):
     """Ensures that desired addon keymap exists. Typically you will only need to specify the name of a '(Global)' 
     section of the keymap preferences."""
-    kc: KeyConfig = bpy.context.window_manager.keyconfigs.addon
-    km = kc.keymaps.new(name, space_type=space_type, region_type=region_type)
-    keymaps[name] = km
-
-addon_keymaps = defaultdict(list)
+    kc = _kc()
+    if kc is None:
+        return
+    keymaps[name] = kc.keymaps.new(name, space_type=space_type, region_type=region_type)
+    addon_keymaps.setdefault(name, [])
+
+# A read-only copy of addon_keymaps, made by freeze_keymaps once registration is complete.
+_frozen_bindings: Optional[dict[str, tuple[KeyMapItem, ...]]] = None
+
+# Modifier keyword arguments for keymap_items.new, keyed by the 'mods' string passed to binding_def.
+_MOD_CACHE: dict[str, dict[str, bool]] = {}
+
+# Property setters for binding_def_one, generated once for each sequence of property names.
+_setter_cache: dict[tuple[str, ...], Callable[[Any, tuple], None]] = {}
+
+def _property_setter(names: tuple[str, ...]) -> Optional[Callable[[Any, tuple], None]]:
+    """Returns a function which assigns a tuple of values to the named attributes of an object, as straight-line
+    code rather than a setattr loop. Returns None if the names aren't valid identifiers."""
+    setter = _setter_cache.get(names)
+    if setter is None:
+        if not all(name.isidentifier() and not iskeyword(name) for name in names):
+            return None
+        source = "def setter(p, v):\n" + "".join(f"    p.{name} = v[{i}]\n" for i, name in enumerate(names))
+        namespace: dict[str, Any] = {}
+        exec(source, namespace)
+        setter = _setter_cache[names] = namespace["setter"]
+    return setter
+
+def binding_def_one(keymap: str, op, key, op_action, mods="", modifier=None, repeat=False, **properties):
+    """Defines a key binding for the specified operator in a single named keymap. This is the common case of
+    binding_def, without the overhead of handling multiple keymaps."""
+    global _frozen_bindings
+    if _kc() is None:
+        # No keymaps can be defined in background mode, so there is nothing to bind to.
+        return
+    mod_dict = _MOD_CACHE.get(mods)
+    if mod_dict is None:
+        mod_dict = _MOD_CACHE[mods] = dict(shift="S" in mods, ctrl="C" in mods, alt="A" in mods)
+    if modifier:
+        mod_dict = {**mod_dict, "key_modifier": modifier}
+    kmi = keymaps[keymap].keymap_items.new(op, key, op_action, repeat=repeat, **mod_dict)
+    if properties:
+        props = kmi.properties
+        setter = _property_setter(tuple(properties)) if len(properties) > 1 else None
+        if setter is not None:
+            setter(props, tuple(properties.values()))
+        else:
+            set_property = props.__setattr__
+            for k, v in properties.items():
+                set_property(k, v)
+    addon_keymaps[keymap].append(kmi)
+    _frozen_bindings = None
 
 def binding_def(maps: Union[str, Iterable[str]], op, key, op_action, mods="", modifier=None,
                 repeat=False, **properties):
     """Defines a key binding for the specified operator in the named keymap(s). Note: the keymaps should be defined before using 'keymap_def' method."""
 
     if isinstance(maps, str):
-        maps = (maps,)
+        return binding_def_one(maps, op, key, op_action, mods, modifier, repeat, **properties)
     for keymap in maps:
-        km = keymaps[keymap]
-        mod_dict = dict(shift="S" in mods, ctrl="C" in mods, alt="A" in mods)
-        if modifier:
-            mod_dict["key_modifier"] = modifier
-        kmi = km.keymap_items.new(op, key, op_action, repeat=repeat, **mod_dict)
-        if properties:
-            for k, v in properties.items():
-                setattr(kmi.properties, k, v)
-        addon_keymaps[keymap].append(kmi)
+        binding_def_one(keymap, op, key, op_action, mods, modifier, repeat, **properties)
+
+def freeze_keymaps():
+    """Snapshots the bindings created so far as tuples, for bindings_clear to use. Call this once all bindings
+    have been registered; defining another binding discards the snapshot."""
+    global _frozen_bindings
+    _frozen_bindings = {km: tuple(items) for km, items in addon_keymaps.items()}
 
 def bindings_clear():
     """Clears all bindings created via binding_def."""
-    for km, items in addon_keymaps.items():
-        keymap = keymaps[km]
-        for kmi in items:
-            keymap.keymap_items.remove(kmi)
+    global _frozen_bindings
+    bindings = _frozen_bindings if _frozen_bindings is not None else addon_keymaps
+    for km, items in bindings.items():
+        # Other addons may share the keymap (and hold references to it), so we only ever remove our own items.
+        # Removing from the end avoids shifting the remaining items on each removal.
+        remove = keymaps[km].keymap_items.remove
+        for kmi in reversed(items):
+            remove(kmi)
     addon_keymaps.clear()
+    _frozen_bindings = None
+    _reset_kc()
 
-_blender_classes = {}
+# Classes to register, in definition order. A class with the same bl_idname as an earlier one replaces it.
+_blender_classes: list[Type] = []
+_blender_class_index: dict[str, int] = {}
 
 def register_BlenderClasses():
     """Registers all classes created via @BlenderClass or @BlenderOperator."""
-    for cls in _blender_classes.values():
-        register_class(cls)
+    register = register_class
+    for cls in _blender_classes:
+        register(cls)
 
 def unregister_BlenderClasses():
     """Unregisters all classes registed via register_BlenderClasses. If an error occurs, the traceback is printed."""
-    for cls in _blender_classes.values():
+    unregister = unregister_class
+    for cls in _blender_classes:
         try:
-            unregister_class(cls)
-        except:
-            exc.print_stack()
+            unregister(cls)
+        except Exception:
+            import traceback
+            traceback.print_exc()
 
 def BlenderClass(cls: Type) -> Type:
     """Notes a blender class with a bl_idname that will be automatically registered via register_BlenderClasses."""
-    _blender_classes[cls.bl_idname] = cls
+    index = _blender_class_index.get(cls.bl_idname)
+    if index is None:
+        _blender_class_index[cls.bl_idname] = len(_blender_classes)
+        _blender_classes.append(cls)
+    else:
+        _blender_classes[index] = cls
     return cls
 
-OPTIONS_NONE = set()
-OPTIONS_UNDO = {"UNDO"}
-OPTIONS_REDO = {"REGISTER", "UNDO"}
+OPTIONS_NONE = frozenset()
+OPTIONS_UNDO = frozenset({"UNDO"})
+OPTIONS_REDO = frozenset({"REGISTER", "UNDO"})
 
 def BlenderOperator(id: str, options=OPTIONS_NONE, label=None, description=None):
     """Wrapper to create a new Blender operator, specifying the standard "bl_" header values. These operators will be
@@ -75,8 +152,7 @@ def BlenderOperator(id: str, options=OPTIONS_NONE, label=None, description=None)
     
     'options' will typically be one of the OPTIONS_* constants. If 'label' is not specified, it will be generated
     from the id."""
-    if not label:
-        label = " ".join(p.capitalize() for p in id[id.rindex(".") + 1:].split("_"))
+    label = label or _titleize(id.rpartition(".")[2])
 
     def wrapper(cls: Type) -> Type:
         cls.bl_idname = id
@@ -87,14 +163,51 @@ def BlenderOperator(id: str, options=OPTIONS_NONE, label=None, description=None)
 
     return wrapper
 
+class AutoRegister:
+    """Base class for Blender classes which will be automatically registered via register_BlenderClasses, as an
+    alternative to the @BlenderClass decorator. Subclasses are noted when they are created, provided that they
+    define their own bl_idname."""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "bl_idname" in cls.__dict__:
+            BlenderClass(cls)
+
+class OperatorBase(AutoRegister):
+    """Base class for Blender operators, as an alternative to the @BlenderOperator decorator. The standard "bl_"
+    header values are given as class keyword arguments, e.g.
+
+        class MyOperator(OperatorBase, Operator, bl_idname="mesh.my_operator", options=OPTIONS_UNDO): ...
+
+    As with BlenderOperator, if 'label' is not specified, it will be generated from the id."""
+
+    def __init_subclass__(cls, bl_idname: Optional[str] = None, options=OPTIONS_NONE, label=None,
+                          description=None, **kwargs):
+        if bl_idname is not None:
+            cls.bl_idname = bl_idname
+            cls.bl_label = label or _titleize(bl_idname.rpartition(".")[2])
+            cls.bl_options = options
+            cls.bl_description = description
+        super().__init_subclass__(**kwargs)
+
 def show_results_dialog(lines: list[str]):
     """Displays a popup dialog with the given lines of text."""
     def draw(self, context: Context):
+        label = self.layout.column(align=True).label
         for line in lines:
-            self.layout.label(text=line)
+            label(text=line)
 
     bpy.context.window_manager.popup_menu(draw, title="Results", icon="INFO")
 
+_label_cache: dict[str, str] = {}
+
+def _titleize(value: str) -> str:
+    """Converts a snake_case name (e.g. "blender_face") into a display label ("Blender Face"), caching the result."""
+    label = _label_cache.get(value)
+    if label is None:
+        label = _label_cache[value] = " ".join(s.capitalize() for s in value.split("_"))
+    return label
+
 def make_enum(*values, is_flag=False, **pairs):
     """Generates an enumerated type from a list of values and pairs. 
     
@@ -102,18 +215,24 @@ def make_enum(*values, is_flag=False, **pairs):
     If pairs are specified, they are added to the enumeration after the values. The pairs are specified
     as keyword arguments, where the key is the name of the enumeration value and the value is the display 
     name. If the display name is not specified, the key is used."""
-    def index(i):
-        return 2**i if is_flag else i
-
-    result: list[tuple] = [
-        *((v, " ".join(s.capitalize()
-                       for s in v.split("_")), "", index(i))
-          for i, v in enumerate(values)),
-        *((k, v, "", index(i + len(values))) for i, (k, v) in enumerate(pairs.items()))
-    ]
+    n = len(values)
+    result: list[tuple] = [()] * (n + len(pairs))
+    if is_flag:
+        for i, v in enumerate(values):
+            result[i] = (v, _titleize(v), "", 1 << i)
+        for i, (k, v) in enumerate(pairs.items(), n):
+            result[i] = (k, v, "", 1 << i)
+    else:
+        for i, v in enumerate(values):
+            result[i] = (v, _titleize(v), "", i)
+        for i, (k, v) in enumerate(pairs.items(), n):
+            result[i] = (k, v, "", i)
     return result
 
+_SEVERITY = (frozenset({"INFO"}), frozenset({"WARNING"}))
+_FINISHED = frozenset({"FINISHED"})
+
 def report_finished(op_self, message, warn=False):
     """A convenience function which reports a message to the user and returns {'FINISHED'}."""
-    op_self.report({"WARNING" if warn else "INFO"}, message)
-    return {"FINISHED"}
+    op_self.report(_SEVERITY[bool(warn)], message)
+    return _FINISHED